@@ -1,20 +1,76 @@
 import re
-from collections import Counter
+from collections import Counter, defaultdict
 import json
+import os
 import xml.etree.ElementTree as ET
 import sys
 
+from spell_checker import MAX_EDIT_DISTANCE, PREFIX_LENGTH, deletes, sidecar_path
+
+
+TELUGU_WORD_RE = re.compile(r'[\u0C00-\u0C7F]+', re.UNICODE)
+TOKENIZE_BATCH_SIZE = 500
+# Words seen fewer times are left out of the delete index (58% of the vocabulary occurs only once);
+# they are still recognised as correct, just never suggested through the index
+DELETE_INDEX_MIN_COUNT = 5
+
+
 def tokenize(text):
     """Extracts Telugu words from a given text (Unicode range \u0C00-\u0C7F)."""
     if not text:
         return []
-    return re.findall(r'[\u0C00-\u0C7F]+', text, re.UNICODE)
+    return TELUGU_WORD_RE.findall(text)
+
+
+def build_delete_index(word_counts, max_edit_distance=MAX_EDIT_DISTANCE, prefix_length=PREFIX_LENGTH,
+                       min_count=DELETE_INDEX_MIN_COUNT):
+    """
+    Builds the Symmetric Delete index: maps every string obtained by deleting up to
+    `max_edit_distance` characters from a word's prefix to the words that produce it.
+    Only words seen at least `min_count` times are indexed.
+    """
+    delete_index = defaultdict(list)
+    for word, count in word_counts.items():
+        if count < min_count:
+            continue
+        for d in deletes(word[:prefix_length], max_edit_distance):
+            delete_index[d].append(word)
+    return delete_index
+
+
+def save_delete_index(word_counts, deletes_path):
+    """Builds the delete index of a model and saves it, with the parameters it was built with, to `deletes_path`."""
+    print(f"Building delete index (max edit distance {MAX_EDIT_DISTANCE}, prefix length {PREFIX_LENGTH}, "
+          f"words seen at least {DELETE_INDEX_MIN_COUNT} times)...")
+    delete_index = build_delete_index(word_counts)
+    print(f"Saving delete index with {len(delete_index)} entries to: {deletes_path}")
+    with open(deletes_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'max_edit_distance': MAX_EDIT_DISTANCE,
+            'prefix_length': PREFIX_LENGTH,
+            'min_count': DELETE_INDEX_MIN_COUNT,
+            'word_count': len(word_counts),
+            'deletes': delete_index,
+        }, f, ensure_ascii=False, separators=(',', ':'))
+
+
+def build_index(model_path='telugu_word_model.json'):
+    """Builds the delete index of an existing model file, without re-parsing the XML dump."""
+    print(f"Loading model from: {model_path}")
+    try:
+        with open(model_path, 'r', encoding='utf-8') as f:
+            word_counts = json.load(f)
+    except FileNotFoundError:
+        print(f"Error: Model file not found at {model_path}. Please run build_model.py first.")
+        return
+    save_delete_index(word_counts, sidecar_path(model_path, 'deletes'))
 
 
 def build_model(xml_path, output_path='telugu_word_model.json'):
     """
     Parses a Wikipedia XML dump using a memory-efficient iterative parser,
-    tokenizes the text, counts word frequencies, and saves the model.
+    tokenizes the text in batches of pages, counts word frequencies, and saves the model
+    along with its Symmetric Delete index.
     """
     word_counts = Counter()
     print(f"Parsing XML file from: {xml_path} using an iterative parser.")
@@ -26,14 +82,18 @@ def build_model(xml_path, output_path='telugu_word_model.json'):
 
         namespace = root.tag.split('}')[0].strip('{')
         text_path = f'./{{{namespace}}}revision/{{{namespace}}}text' 
+        page_tag = f'{{{namespace}}}page'
 
         page_count = 0
+        batch = []
         for event, elem in context:
-            if event == 'end' and elem.tag == f'{{{namespace}}}page':
+            if elem.tag == page_tag and event == 'end':
                 text_element = elem.find(text_path)
                 if text_element is not None and text_element.text:
-                    words = tokenize(text_element.text)
-                    word_counts.update(words)
+                    batch.append(text_element.text)
+                    if len(batch) >= TOKENIZE_BATCH_SIZE:
+                        word_counts.update(tokenize('\n'.join(batch)))
+                        batch.clear()
 
                 page_count += 1
                 if page_count % 5000 == 0:
@@ -41,12 +101,21 @@ def build_model(xml_path, output_path='telugu_word_model.json'):
 
                 root.clear()
 
+        word_counts.update(tokenize('\n'.join(batch)))
+
         print(f"\nProcessing complete. Processed a total of {page_count} pages.")
         print(f"Model created with {len(word_counts)} unique words.")
 
         print(f"Saving model to: {output_path}")
         with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(dict(word_counts), f, ensure_ascii=False, indent=4)
+            json.dump(word_counts, f, ensure_ascii=False, separators=(',', ':'))
+        with open(sidecar_path(output_path, 'meta'), 'w', encoding='utf-8') as f:
+            json.dump({
+                'total_words': sum(word_counts.values()),
+                'unique_words': len(word_counts),
+            }, f)
+
+        save_delete_index(word_counts, sidecar_path(output_path, 'deletes'))
             
     except FileNotFoundError:
         print(f"Error: XML file not found at {xml_path}. Please check the path.")
@@ -55,4 +124,7 @@ def build_model(xml_path, output_path='telugu_word_model.json'):
 
 if __name__ == "__main__":
     WIKI_XML_PATH = 'tewiki-latest-pages-articles.xml' 
-    build_model(WIKI_XML_PATH)
\ No newline at end of file
+    if sys.argv[1:2] == ['--index-only']:
+        build_index(*sys.argv[2:3])
+    else:
+        build_model(WIKI_XML_PATH)
\ No newline at end of file
@@ -1,51 +1,236 @@
 # spell_checker.py (Enhanced with CLI Menu)
 
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+import gc
+import heapq
+import io
 import json
+import os
 import re
 from collections import Counter
 from itertools import chain
 import sys
 
 
+MAX_EDIT_DISTANCE = 2
+PREFIX_LENGTH = 7
+PARALLEL_MIN_WORDS = 64
+MAX_SUGGESTIONS = 10
+MAX_CACHED_CORRECTIONS = 50_000
+
+# Splits text into (telugu_word, '') or ('', separator) pairs.
+TOKEN_RE = re.compile(r'([\u0C00-\u0C7F]+)|(\W+)', re.UNICODE)
+
 TELUGU_ALPHABET = 'అఆఇఈఉఊఋౠఎఏఐఒఓఔంఃకఖగఘఙచఛజఝఞటఠడఢణతథదధనపఫబభమయరలవశషసహళక్షఱ'
+# Distinct letters as prebuilt 1-char strings (క and ష also appear inside క్ష)
+_ALPHABET = tuple(sys.intern(c) for c in dict.fromkeys(TELUGU_ALPHABET))
+
+def _edits1_iter(word, _alphabet=_ALPHABET):
+    """Yields the strings one edit away from the word (possibly with repeats), without building a set."""
+    for i in range(len(word) + 1):
+        L, R = word[:i], word[i:]
+        if R:
+            tail = R[1:]
+            yield L + tail
+            if tail:
+                yield L + tail[0] + R[0] + tail[1:]
+            # Restrict generation to only use the Telugu alphabet; replaces and inserts share the `L + c` prefix
+            for c in _alphabet:
+                prefix = L + c
+                yield prefix + R
+                yield prefix + tail
+        else:
+            for c in _alphabet:
+                yield L + c
+
 
 def edits1(word):
     """Generates all possible corrections that are one edit away from the word."""
-    splits = [(word[:i], word[i:]) for i in range(len(word) + 1)]
-    deletes = [L + R[1:] for L, R in splits if R]
-    transposes = [L + R[1] + R[0] + R[2:] for L, R in splits if len(R) > 1]
-    # Restrict generation to only use the Telugu alphabet
-    replaces = [L + c + R[1:] for L, R in splits if R for c in TELUGU_ALPHABET]
-    inserts = [L + c + R for L, R in splits for c in TELUGU_ALPHABET]
-    return set(deletes + transposes + replaces + inserts)
+    return set(_edits1_iter(word))
 
 
 def edits2(word):
     """Generates all possible corrections that are two edits away from the word."""
-    return (e2 for e1 in edits1(word) for e2 in edits1(e1))
+    return (e2 for e1 in edits1(word) for e2 in _edits1_iter(e1))
+
+
+def deletes(word, max_distance=MAX_EDIT_DISTANCE):
+    """Generates the word and all strings obtained by deleting up to `max_distance` characters from it."""
+    results = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        results.update(frontier)
+    return results
+
+
+def damerau_levenshtein(a, b, max_distance=None):
+    """
+    Returns the (unrestricted) Damerau-Levenshtein distance between two words, computed with the
+    Lowrance-Wagner algorithm: a transposition may be combined with edits of the letters between the swapped pair.
+    With `max_distance`, returns `max_distance + 1` for any distance above it.
+    """
+    # Drop the shared prefix and suffix; an optimal edit sequence never needs to touch them
+    start = 0
+    while start < len(a) and start < len(b) and a[start] == b[start]:
+        start += 1
+    end = 0
+    while end < len(a) - start and end < len(b) - start and a[-1 - end] == b[-1 - end]:
+        end += 1
+    a, b = a[start:len(a) - end], b[start:len(b) - end]
+
+    if max_distance is not None and abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+
+    # d[i + 1][j + 1] is the distance between a[:i] and b[:j]; row and column 0 are a sentinel
+    infinity = len(a) + len(b)
+    d = [[infinity] * (len(b) + 2)]
+    d.extend([infinity, i] + [0] * len(b) for i in range(len(a) + 1))
+    d[1][1:] = range(len(b) + 1)
+    last_row = {}  # letter -> last row of `a` it was seen in
+    for i in range(1, len(a) + 1):
+        prev, cur = d[i], d[i + 1]
+        last_col = 0  # last column of `b` matching a[i - 1]
+        for j in range(1, len(b) + 1):
+            k = last_row.get(b[j - 1], 0)
+            l = last_col
+            if a[i - 1] == b[j - 1]:
+                cost = 0
+                last_col = j
+            else:
+                cost = 1
+            cur[j + 1] = min(prev[j] + cost, cur[j] + 1, prev[j + 1] + 1,
+                             d[k][l] + (i - k - 1) + 1 + (j - l - 1))
+        last_row[a[i - 1]] = i
+        # Row minima never decrease (a transposition from row k costs at least the deletions down to row i - 1),
+        # so once a whole row exceeds the bound the distance does too
+        if max_distance is not None and min(cur[1:]) > max_distance:
+            return max_distance + 1
+    distance = d[-1][-1]
+    if max_distance is not None:
+        return min(distance, max_distance + 1)
+    return distance
+
+
+def within_distance(word, candidates, max_distance):
+    """Returns {candidate: distance} for the candidates within `max_distance` edits of the word."""
+    distances = {}
+    for c in candidates:
+        if abs(len(c) - len(word)) <= max_distance:
+            distance = damerau_levenshtein(word, c, max_distance)
+            if distance <= max_distance:
+                distances[c] = distance
+    return distances
+
+
+def sidecar_path(model_path, name, ext=None):
+    """Returns the path of an index file stored next to the model, e.g. `telugu_word_model.deletes.json`."""
+    base, model_ext = os.path.splitext(model_path)
+    return f"{base}.{name}{ext or model_ext}"
 
 
 class SpellChecker:
-    def __init__(self, model_path):
-        """Loads the word frequency index (Language Model) from secondary memory (JSON file) into main memory."""
+    def __init__(self, model_path, workers=None):
+        """
+        Loads the word frequency index (Language Model) from secondary memory (JSON file) into main memory.
+        With `workers` set, texts with many unknown words are corrected in that many worker processes.
+        """
+        self.workers = workers
+        self._executor = None
+        self.load(model_path)
+            
+        self.source_document = None 
+        self.candidates_map = {} 
+
+    def load(self, model_path):
+        """
+        Loads the language model and whichever indexes were built next to it.
+        Cached corrections and worker processes belong to the previous model, so they are dropped.
+        """
+        self.close()
         self.model_path = model_path
+        self._corr_cache = {}
+        # Loading builds millions of index lists: pause the garbage collector meanwhile, leaving it as the caller had it
+        was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            self._load(model_path)
+        finally:
+            if was_enabled:
+                gc.enable()
+
+    def _load(self, model_path):
+        """Reads the model file and its index sidecars."""
         print(f"Loading word model from {model_path}...")
         try:
             with open(model_path, 'r', encoding='utf-8') as f:
-                self.WORDS = Counter(json.load(f))
-            self.TOTAL_WORDS = sum(self.WORDS.values())
+                self.WORDS = json.load(f)
+            try:
+                with open(sidecar_path(model_path, 'meta'), 'r', encoding='utf-8') as f:
+                    self.TOTAL_WORDS = json.load(f)['total_words']
+            except FileNotFoundError:
+                self.TOTAL_WORDS = sum(self.WORDS.values())
             print(f"✅ Model loaded with {len(self.WORDS)} unique words.")
         except FileNotFoundError:
             print(f"❌ Error: Model file not found at {model_path}. Please run build_model.py first.")
-            self.WORDS = Counter()
+            self.WORDS = {}
             self.TOTAL_WORDS = 0
-            
-        self.source_document = None 
-        self.candidates_map = {} 
+
+        self.DELETES = {}
+        self.MAX_EDIT_DISTANCE = MAX_EDIT_DISTANCE
+        self.PREFIX_LENGTH = PREFIX_LENGTH
+        deletes_path = sidecar_path(model_path, 'deletes')
+        try:
+            with open(deletes_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            # An index left over from another build would suggest words this model does not have
+            if index.get('word_count') != len(self.WORDS):
+                print(f"⚠️ Delete index at {deletes_path} does not match the model. Falling back to edit generation.")
+            else:
+                self.DELETES = index['deletes']
+                self.MAX_EDIT_DISTANCE = index['max_edit_distance']
+                self.PREFIX_LENGTH = index['prefix_length']
+                print(f"✅ Delete index loaded with {len(self.DELETES)} entries.")
+        except FileNotFoundError:
+            print(f"ℹ️ Delete index not found at {deletes_path}.")
 
     def known(self, words):
         """Returns the subset of `words` that appear in the language model."""
-        return set(w for w in words if w in self.WORDS)
+        return {w for w in words if w in self.WORDS}
+
+    def lookup_deletes(self, word):
+        """
+        Symmetric Delete lookup: collects dictionary words sharing a delete with the word,
+        then keeps those within the smallest edit distance tier (<= 1, otherwise <= MAX_EDIT_DISTANCE).
+        """
+        candidates = set()
+        for d in deletes(word[:self.PREFIX_LENGTH], self.MAX_EDIT_DISTANCE):
+            candidates.update(self.DELETES.get(d, ()))
+
+        return self.closest(word, self.known(candidates))
+
+    def closest(self, word, candidates):
+        """Keeps the candidates within the smallest edit distance tier (<= 1, otherwise <= MAX_EDIT_DISTANCE)."""
+        distances = within_distance(word, candidates, self.MAX_EDIT_DISTANCE)
+        return {c for c, d in distances.items() if d <= 1} or set(distances)
+
+    def generate_candidates(self, word):
+        """
+        Returns the set of known candidates in the smallest edit distance tier found for the word.
+        A known word is its own only candidate, so no edits are generated for it.
+        """
+        if word in self.WORDS:
+            return {word}
+        if self.DELETES:
+            return self.lookup_deletes(word)
+
+        candidates = self.known(_edits1_iter(word))
+        
+        if not candidates: 
+             candidates.update(self.known(edits2(word)))
+
+        return candidates
 
     def get_candidates(self, word):
         """
@@ -53,19 +238,14 @@ class SpellChecker:
         Ranking is based on: 1) Minimal edit distance, 2) Word frequency (semantics).
         """
         
-        candidates = self.known([word]) 
-        
-        candidates.update(self.known(edits1(word)))
-        
-        if not candidates and word not in self.WORDS: 
-             candidates.update(self.known(set(edits2(word))))
+        candidates = self.generate_candidates(word)
 
         if not candidates:
             return [(word, 0)] 
 
         ranked_candidates = sorted(
             [(c, self.WORDS.get(c, 0)) for c in candidates],
-            key=lambda item: item[1],
+            key=lambda item: (item[1], item[0]),
             reverse=True
         )
 
@@ -74,13 +254,35 @@ class SpellChecker:
     def correct_word(self, word):
         """
         Selects the single best correction for a word.
-        Returns the best correction word and the list of (candidate, frequency) tuples.
+        Returns the best correction word and the top MAX_SUGGESTIONS (candidate, frequency) tuples.
+        Known words are returned as-is; corrections are cached so repeated misspellings are not recomputed.
         """
-        ranked_candidates = self.get_candidates(word)
+        word = sys.intern(word)
+        if word in self._corr_cache:
+            return self._corr_cache[word]
+
+        if word in self.WORDS:
+            return word, [(word, self.WORDS[word])]
+
+        candidates = self.generate_candidates(word)
+
+        if candidates:
+            # Break frequency ties by the word itself, so the ranking does not depend on set (hash) order
+            top_candidates = heapq.nlargest(MAX_SUGGESTIONS, candidates, key=lambda c: (self.WORDS[c], c))
+            ranked_candidates = [(c, self.WORDS[c]) for c in top_candidates]
+        else:
+            ranked_candidates = [(word, 0)]
         
         best_correction, _ = ranked_candidates[0]
         
+        self.cache_correction(word, (best_correction, ranked_candidates))
         return best_correction, ranked_candidates
+
+    def cache_correction(self, word, correction):
+        """Stores a correction, evicting the oldest one once MAX_CACHED_CORRECTIONS are cached."""
+        if len(self._corr_cache) >= MAX_CACHED_CORRECTIONS:
+            del self._corr_cache[next(iter(self._corr_cache))]
+        self._corr_cache[word] = correction
     
     def correct_text(self, text):
         """
@@ -90,15 +292,15 @@ class SpellChecker:
         self.source_document = text
         self.candidates_map = {} 
 
-        parts = re.findall(r'([\u0C00-\u0C7F]+|\W+)', text, re.UNICODE) 
+        parts = TOKEN_RE.findall(text)
         
+        corrections = self.correct_in_parallel({word for word, _ in parts if word}) if self.workers else {}
+
         corrected_parts = []
         
-        for part in parts:
-            if re.match(r'[\u0C00-\u0C7F]+', part, re.UNICODE): 
-                word = part
-                
-                best_correction, candidates_with_freq = self.correct_word(word)
+        for word, separator in parts:
+            if word: 
+                best_correction, candidates_with_freq = corrections.get(word) or self.correct_word(word)
                 
                 if best_correction != word:
                     corrected_parts.append(best_correction)
@@ -106,12 +308,56 @@ class SpellChecker:
                 else:
                     corrected_parts.append(word)
             else:
-                corrected_parts.append(part)
+                corrected_parts.append(separator)
 
         corrected_sentence = "".join(corrected_parts)
         
         return corrected_sentence, self.candidates_map
 
+    def correct_in_parallel(self, words):
+        """
+        Corrects the unknown words among `words` in worker processes and returns {word: correction}.
+        The results are returned rather than read back from the correction cache, which may already have evicted
+        some of them. Returns {} for texts with few unknown words, or when the delete index is loaded:
+        its lookups take a few milliseconds, while every worker would reload the model and the index.
+        """
+        if self.DELETES:
+            return {}
+        pending = [w for w in words if w not in self.WORDS and w not in self._corr_cache]
+        if len(pending) < PARALLEL_MIN_WORDS:
+            return {}
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.model_path,),
+            )
+        chunksize = max(1, len(pending) // (4 * self.workers))
+        corrections = dict(zip(pending, self._executor.map(_correct_word_in_worker, pending, chunksize=chunksize)))
+        for word, correction in corrections.items():
+            self.cache_correction(word, correction)
+        return corrections
+
+    def close(self):
+        """Shuts down the worker processes, if any were started."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+
+_worker_checker = None
+
+def _init_worker(model_path):
+    """Loads the language model once in each worker process."""
+    global _worker_checker
+    with redirect_stdout(io.StringIO()):
+        _worker_checker = SpellChecker(model_path)
+
+
+def _correct_word_in_worker(word):
+    return _worker_checker.correct_word(word)
+
 
 
 def run_test_cases(checker):
@@ -210,6 +456,9 @@ if __name__ == "__main__":
     MODEL_PATH = 'telugu_word_model.json'
 
     checker = SpellChecker(MODEL_PATH)
+    # The model stays loaded for the whole session: move it out of the garbage collector's
+    # tracked generations so later collections do not rescan millions of index lists.
+    gc.freeze()
     
     if checker.TOTAL_WORDS > 0:
         main_menu(checker)
\ No newline at end of file
@@ -0,0 +1,131 @@
+from contextlib import redirect_stdout
+import io
+import json
+import os
+import random
+import tempfile
+import unittest
+
+from build_model import build_delete_index
+from spell_checker import MAX_EDIT_DISTANCE, PREFIX_LENGTH, _ALPHABET, SpellChecker, damerau_levenshtein, sidecar_path
+
+WORDS = {'అమ్మ': 40, 'నాన్న': 30, 'ప్రేమలో': 20, 'క్రీడలు': 15, 'తెలుగు': 50, 'భాష': 25, 'దేశం': 35, 'ముఖ్యం': 10}
+
+
+def reference_damerau_levenshtein(a, b):
+    """Textbook Lowrance-Wagner DP: no prefix/suffix stripping, no bound."""
+    infinity = len(a) + len(b)
+    d = [[infinity] * (len(b) + 2) for _ in range(len(a) + 2)]
+    for i in range(len(a) + 1):
+        d[i + 1][1] = i
+    for j in range(len(b) + 1):
+        d[1][j + 1] = j
+    last_row = {}
+    for i in range(1, len(a) + 1):
+        last_col = 0
+        for j in range(1, len(b) + 1):
+            k, l = last_row.get(b[j - 1], 0), last_col
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            if cost == 0:
+                last_col = j
+            d[i + 1][j + 1] = min(d[i][j] + cost, d[i + 1][j] + 1, d[i][j + 1] + 1,
+                                  d[k][l] + (i - k - 1) + 1 + (j - l - 1))
+        last_row[a[i - 1]] = i
+    return d[-1][-1]
+
+
+class DamerauLevenshteinTest(unittest.TestCase):
+    def test_examples(self):
+        self.assertEqual(damerau_levenshtein('', ''), 0)
+        self.assertEqual(damerau_levenshtein('ab', 'ba'), 1)
+        self.assertEqual(damerau_levenshtein('ca', 'abc'), 2)
+        # Deleting ్ leaves ర and ప adjacent, and swapping them is the second edit
+        self.assertEqual(damerau_levenshtein('రపేమలో', 'ప్రేమలో'), 2)
+        self.assertEqual(damerau_levenshtein('రకీడలు', 'క్రీడలు'), 2)
+        self.assertEqual(damerau_levenshtein('రపేమలో', 'ప్రేమలో', 1), 2)
+
+    def test_matches_unbounded_dp(self):
+        rng = random.Random(0)
+        for _ in range(50_000):
+            # A small alphabet makes repeated letters, and so long-range transpositions, common
+            a = ''.join(rng.choice('abcd') for _ in range(rng.randint(0, 9)))
+            b = ''.join(rng.choice('abcd') for _ in range(rng.randint(0, 9)))
+            expected = reference_damerau_levenshtein(a, b)
+            self.assertEqual(damerau_levenshtein(a, b), expected, (a, b))
+            for max_distance in range(4):
+                self.assertEqual(damerau_levenshtein(a, b, max_distance), min(expected, max_distance + 1),
+                                 (a, b, max_distance))
+
+
+def write_model(directory, words, index_words=None, word_count=None):
+    """
+    Writes a model to `directory` and, unless `index_words` is False, a delete index of `index_words`
+    (default: the model's words) recording `word_count` (default: the model's). Returns the model path.
+    """
+    os.makedirs(directory, exist_ok=True)
+    model_path = os.path.join(directory, 'model.json')
+    with open(model_path, 'w', encoding='utf-8') as f:
+        json.dump(words, f, ensure_ascii=False)
+    if index_words is not False:
+        with open(sidecar_path(model_path, 'deletes'), 'w', encoding='utf-8') as f:
+            json.dump({
+                'max_edit_distance': MAX_EDIT_DISTANCE,
+                'prefix_length': PREFIX_LENGTH,
+                'min_count': 1,
+                'word_count': len(words) if word_count is None else word_count,
+                'deletes': build_delete_index(words if index_words is None else index_words, min_count=1),
+            }, f, ensure_ascii=False)
+    return model_path
+
+
+def load_checker(model_path):
+    with redirect_stdout(io.StringIO()):
+        return SpellChecker(model_path)
+
+
+class LookupDeletesTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def typos(self):
+        """Substitutions (by letters the edit path can substitute back) and transpositions of the model words."""
+        for word in WORDS:
+            for i in range(len(word)):
+                if word[i] in _ALPHABET:
+                    for c in _ALPHABET[::5]:
+                        yield word[:i] + c + word[i + 1:]
+                if i + 1 < len(word):
+                    yield word[:i] + word[i + 1] + word[i] + word[i + 2:]
+
+    def test_same_tier_as_edit_path(self):
+        indexed = load_checker(write_model(os.path.join(self.directory, 'indexed'), WORDS))
+        plain = load_checker(write_model(os.path.join(self.directory, 'plain'), WORDS, index_words=False))
+        self.assertTrue(indexed.DELETES)
+        self.assertFalse(plain.DELETES)
+        for typo in self.typos():
+            if typo in WORDS:
+                continue
+            found = indexed.lookup_deletes(typo)
+            expected = plain.generate_candidates(typo)
+            with self.subTest(typo=typo):
+                self.assertTrue(found)
+                # The edit path only inserts alphabet letters, so the index may find more words, but in the same tier
+                self.assertLessEqual(expected, found)
+                self.assertEqual({damerau_levenshtein(typo, c) for c in found},
+                                 {damerau_levenshtein(typo, c) for c in expected})
+
+    def test_mismatched_word_count_disables_index(self):
+        checker = load_checker(write_model(self.directory, WORDS, word_count=len(WORDS) + 1))
+        self.assertFalse(checker.DELETES)
+        self.assertEqual(checker.correct_word('దేసం')[0], 'దేశం')
+
+    def test_ignores_words_missing_from_model(self):
+        words = {'అమ్మ': 40, 'నాన్న': 30}
+        checker = load_checker(write_model(self.directory, words, index_words={**words, 'అమ్మా': 50}))
+        self.assertEqual(checker.correct_text('అమ్మి'), ('అమ్మ', {'అమ్మి': ['అమ్మ']}))
+
+
+if __name__ == '__main__':
+    unittest.main()